@@ -6,80 +6,253 @@ SPDX-License-Identifier: GPL-3.0-or-later
 """
 
 import argparse
+import os
+import queue
 import re
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# Default number of threads used to walk the directory tree
+DEFAULT_WALK_THREADS = min(32, (os.cpu_count() or 1) * 4)
+
+# Default size limit for checked files, in MiB
+DEFAULT_MAX_SIZE_MIB = 4
+
+# Number of leading bytes searched for NUL to detect binary files
+BINARY_SNIFF_SIZE = 4096
 
-def find_text_files(directory: Path, extensions: list[str]) -> list[Path]:
-    """Find all text files with given extensions in directory.
+
+def walk_text_files(
+    directory: Path,
+    extensions: tuple[str, ...],
+    exclude_dirs: frozenset[str],
+    max_size: int | None = None,
+) -> list[Path]:
+    """Find all text files with given extensions in directory sequentially.
 
     Args:
         directory: Directory to search in
-        extensions: List of file extensions to include
+        extensions: File extensions to include
+        exclude_dirs: Set of directory names to skip
+        max_size: Skip files larger than this many bytes (None for no limit)
 
     Returns:
-        List of paths to text files
+        Sorted list of paths to text files
 
     """
     result = []
-
-    # Handle specific extensions first
-    for ext in extensions:
-        for file_path in directory.glob(f"**/*{ext}"):
-            if file_path.is_file():
+    for root, dirs, files in directory.walk():
+        # Prune excluded directories before Path.walk descends into them
+        dirs[:] = [d for d in dirs if d not in exclude_dirs]
+        for name in files:
+            if not name.endswith(extensions):
+                continue
+            file_path = root / name
+            # Skip anything but regular files, e.g. dangling symlinks or FIFOs
+            if not file_path.is_file():
+                continue
+            try:
+                size = file_path.stat().st_size
+            except OSError as e:
+                print(f"Error reading {file_path}: {e}", file=sys.stderr)  # noqa: T201
+                continue
+            if max_size is None or size <= max_size:
                 result.append(file_path)
+    return sorted(result)
+
+
+def find_text_files(
+    directory: Path,
+    extensions: tuple[str, ...],
+    exclude_dirs: frozenset[str],
+    max_size: int | None = None,
+    threads: int = DEFAULT_WALK_THREADS,
+) -> list[Path]:
+    """Find all text files with given extensions in directory.
+
+    The tree is walked once with ``os.scandir``. Directories are handed out to
+    a pool of worker threads, which overlap the latency of the underlying
+    syscalls. Excluded directories are pruned before they are entered.
+
+    Args:
+        directory: Directory to search in
+        extensions: File extensions to include
+        exclude_dirs: Set of directory names to skip
+        max_size: Skip files larger than this many bytes (None for no limit)
+        threads: Number of worker threads, 1 walks the tree sequentially
+
+    Returns:
+        Sorted list of paths to text files
+
+    """
+    if threads <= 1:
+        return walk_text_files(directory, extensions, exclude_dirs, max_size)
+
+    result: list[Path] = []
+    result_lock = threading.Lock()
+    pending: queue.Queue[str | None] = queue.Queue()
+
+    def worker() -> None:
+        while (path := pending.get()) is not None:
+            found = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude_dirs:
+                                pending.put(entry.path)
+                        elif entry.is_file() and entry.name.endswith(extensions):
+                            try:
+                                size = entry.stat().st_size
+                            except OSError as e:
+                                print(  # noqa: T201
+                                    f"Error reading {entry.path}: {e}", file=sys.stderr
+                                )
+                                continue
+                            if max_size is None or size <= max_size:
+                                found.append(Path(entry.path))
+            except OSError as e:
+                print(f"Error reading {path}: {e}", file=sys.stderr)  # noqa: T201
+            finally:
+                with result_lock:
+                    result.extend(found)
+                pending.task_done()
+
+    pending.put(os.fspath(directory))
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    # Wait until every queued directory has been scanned, then stop the workers
+    pending.join()
+    for _ in workers:
+        pending.put(None)
+    for thread in workers:
+        thread.join()
+
+    return sorted(result)
+
+
+# Whitespace immediately followed by a line break
+TRAILING_WHITESPACE_MARKERS = (b" \n", b"\t\n", b" \r", b"\t\r")
+
+# Spaces and tabs at the end of a line, matched from the start of the run; as
+# with bytes.splitlines(), lines end at LF, CRLF or a lone CR
+TRAILING_WHITESPACE_BYTES_PATTERN = re.compile(rb"(?<![ \t])[ \t]+(?=[\r\n]|\Z)")
+
+# Trailing whitespace of a reported line, to be marked in the output
+TRAILING_WHITESPACE_PATTERN = re.compile(r"([ \t]+)$")
+
+
+def looks_binary(data: bytes) -> bool:
+    """Check whether file contents look like binary data.
 
-    return result
+    Args:
+        data: Raw file contents
 
+    Returns:
+        True if a NUL byte occurs near the start of the contents
+
+    """
+    return b"\0" in data[:BINARY_SNIFF_SIZE]
 
-def check_file_for_trailing_whitespace(file_path: Path) -> list[tuple[int, str]]:
+
+def may_have_trailing_whitespace(data: bytes) -> bool:
+    """Quickly check whether raw file contents can contain trailing whitespace.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        False if the contents certainly have no trailing whitespace
+
+    """
+    if not data:
+        return False
+    if data[-1:] in (b" ", b"\t"):
+        return True
+    return any(data.find(marker) != -1 for marker in TRAILING_WHITESPACE_MARKERS)
+
+
+def check_file_for_trailing_whitespace(
+    file_path: Path, skip_binary: bool = True
+) -> list[tuple[int, str]]:
     """Check a file for trailing whitespace.
 
     Args:
         file_path: Path to the file to check
+        skip_binary: Whether to skip files that look binary
 
     Returns:
         List of (line_number, line_content) pairs with trailing whitespace
 
     """
-    trailing_whitespace_pattern = re.compile(r"[ \t]+$")
     results = []
 
     try:
-        with file_path.open(encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                if trailing_whitespace_pattern.search(line):
-                    results.append((line_num, line.rstrip("\n")))
+        # Work on raw bytes; only the reported lines are ever decoded
+        data = file_path.read_bytes()
+        if skip_binary and looks_binary(data):
+            return results
+        if not may_have_trailing_whitespace(data):
+            return results
+
+        line_num = 1
+        line_start = 0
+        for match in TRAILING_WHITESPACE_BYTES_PATTERN.finditer(data):
+            # Count LF, CR and CRLF line breaks, CRLF only once
+            start = match.start()
+            line_num += (
+                data.count(b"\n", line_start, start)
+                + data.count(b"\r", line_start, start)
+                - data.count(b"\r\n", line_start, start)
+            )
+            line_start = (
+                max(data.rfind(b"\n", 0, start), data.rfind(b"\r", 0, start)) + 1
+            )
+            line = data[line_start : match.end()].decode("utf-8", errors="replace")
+            results.append((line_num, line))
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)  # noqa: T201
 
     return results
 
 
-def remove_trailing_whitespace(file_path: Path) -> int:
+def remove_trailing_whitespace(file_path: Path, skip_binary: bool = True) -> int:
     """Remove trailing whitespace from a file.
 
     Args:
         file_path: Path to the file to modify
+        skip_binary: Whether to skip files that look binary
 
     Returns:
         Number of lines modified
 
     """
-    trailing_whitespace_pattern = re.compile(r"[ \t]+$")
     modified_lines = 0
 
     try:
-        with file_path.open(encoding="utf-8") as f:
-            lines = f.readlines()
-
-        with file_path.open("w", encoding="utf-8") as f:
-            for line in lines:
-                new_line, count = trailing_whitespace_pattern.subn("", line)
-                if count > 0:
-                    modified_lines += 1
-                f.write(new_line)
+        # Read and write the whole file at once; line endings are kept as-is
+        data = file_path.read_bytes()
+        if skip_binary and looks_binary(data):
+            return modified_lines
+        if not may_have_trailing_whitespace(data):
+            return modified_lines
+
+        output = []
+        for line in data.splitlines(keepends=True):
+            content = line.rstrip(b"\r\n")
+            stripped = content.rstrip(b" \t")
+            if len(stripped) != len(content):
+                modified_lines += 1
+            output.append(stripped + line[len(content) :])
+
+        # Leave the file (and its mtime) alone unless something was stripped
+        if modified_lines > 0:
+            file_path.write_bytes(b"".join(output))
     except Exception as e:
         print(f"Error processing {file_path}: {e}", file=sys.stderr)  # noqa: T201
 
@@ -119,41 +292,66 @@ def main() -> int:
         help="Comma-separated list of directories to exclude (default: "
         ".git,__pycache__,venv,.venv,dist,build,.pytest_cache,.ruff_cache)",
     )
+    parser.add_argument(
+        "--walk-threads",
+        type=int,
+        default=DEFAULT_WALK_THREADS,
+        help="Number of threads used to walk the directory tree, 1 walks it "
+        f"sequentially (default: {DEFAULT_WALK_THREADS})",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=DEFAULT_MAX_SIZE_MIB,
+        help=f"Skip files larger than this many MiB (default: {DEFAULT_MAX_SIZE_MIB})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Check files regardless of their size or binary content",
+    )
 
     args = parser.parse_args()
     directory = Path(args.directory)
-    extensions = args.extensions.split(",")
-    exclude_dirs = args.exclude.split(",")
+    exclude_dirs = frozenset(args.exclude.split(","))
 
     # Convert extensions to include dot prefix if needed
-    extensions = [ext if ext.startswith(".") else f".{ext}" for ext in extensions]
+    extensions = tuple(
+        ext if ext.startswith(".") else f".{ext}" for ext in args.extensions.split(",")
+    )
 
-    # Find text files
-    text_files = find_text_files(directory, extensions)
+    # Find text files, skipping excluded directories
+    max_size = None if args.force else args.max_size * 1024 * 1024
+    text_files = find_text_files(
+        directory, extensions, exclude_dirs, max_size, threads=args.walk_threads
+    )
 
-    # Filter out excluded directories
-    text_files = [
-        f
-        for f in text_files
-        if not any(exclude_dir in str(f) for exclude_dir in exclude_dirs)
-    ]
+    # Check or fix files in parallel; results come back in input order, so the
+    # report stays deterministic
+    process_file = partial(
+        remove_trailing_whitespace if args.fix else check_file_for_trailing_whitespace,
+        skip_binary=not args.force,
+    )
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(process_file, text_files, chunksize=32))
 
-    # Check or fix files
     found_issues = False
-    for file_path in text_files:
+    for file_path, result in zip(text_files, results, strict=True):
         if args.fix:
-            modified_lines = remove_trailing_whitespace(file_path)
+            modified_lines = result
             if modified_lines > 0:
                 print(f"Fixed {modified_lines} line(s) in {file_path}")  # noqa: T201
                 found_issues = True
         else:
-            issues = check_file_for_trailing_whitespace(file_path)
+            issues = result
             if issues:
-                print(f"Found trailing whitespace in {file_path}:")  # noqa: T201
+                # Write the report of each file at once
+                report = [f"Found trailing whitespace in {file_path}:\n"]
                 for line_num, line in issues:
                     # Mark trailing whitespace with '<--'
-                    display_line = re.sub(r"([ \t]+)$", r"\1<--", line)
-                    print(f"  Line {line_num}: {display_line}")  # noqa: T201
+                    display_line = TRAILING_WHITESPACE_PATTERN.sub(r"\1<--", line)
+                    report.append(f"  Line {line_num}: {display_line}\n")
+                sys.stdout.write("".join(report))
                 found_issues = True
 
     if found_issues:
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Script to compile the default configuration into a Python module.
+
+The default configuration is parsed at import time of gmail_tui. Parsing a
+Python literal is much cheaper than parsing YAML, so the parsed contents of
+default.yaml are kept in _default_parsed.py. Run this script after editing
+default.yaml, then format the result with ``ruff format``.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+import argparse
+import pprint
+import sys
+from pathlib import Path
+
+import yaml
+
+CONFIG_DIR = Path(__file__).parent.parent / "src" / "gmail_tui" / "config"
+
+MODULE_TEMPLATE = '''"""Parsed default configuration for Gmail TUI.
+
+Generated from default.yaml by scripts/generate_default_config.py, do not edit.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from typing import Any
+
+DEFAULT: dict[str, Any] = {default}
+'''
+
+
+def generate(source: Path) -> str:
+    """Generate the source of the parsed default configuration module.
+
+    Args:
+        source: Path to the default YAML configuration
+
+    Returns:
+        Python source code of the module
+
+    """
+    with source.open() as f:
+        default = yaml.safe_load(f)
+    return MODULE_TEMPLATE.format(default=pprint.pformat(default, sort_dicts=False))
+
+
+def main() -> int:
+    """Execute the default configuration generator.
+
+    Returns:
+        Exit code (0 for success)
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Compile the default configuration into a Python module"
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=CONFIG_DIR / "default.yaml",
+        help="Default YAML configuration (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=CONFIG_DIR / "_default_parsed.py",
+        help="Generated Python module (default: %(default)s)",
+    )
+
+    args = parser.parse_args()
+    args.output.write_text(generate(args.source))
+    sys.stdout.write(f"Wrote {args.output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,46 @@ SPDX-License-Identifier: GPL-3.0-or-later
 __version__ = "0.1.0"
 
 import argparse
+import importlib
+import sys
 
-from gmail_tui.app import main as app
-from gmail_tui.commands.init import InitCommand
-from gmail_tui.commands.list import ListCommand
-from gmail_tui.commands.tree import TreeCommand
+from gmail_tui.commands.base import Command
+
+# Available commands: name -> (module, class, help)
+# Command modules are only imported when the command is requested; the help
+# text is kept here, so the other commands are listed without importing them,
+# and Command.help reads it from here as well
+_COMMANDS: dict[str, tuple[str, str, str]] = {
+    "init": (
+        "gmail_tui.commands.init",
+        "InitCommand",
+        "Initialize Gmail TUI configuration",
+    ),
+    "ls": (
+        "gmail_tui.commands.list",
+        "ListCommand",
+        "List emails in a folder (outputs metadata in various formats)",
+    ),
+    "tree": (
+        "gmail_tui.commands.tree",
+        "TreeCommand",
+        "Display email folders in tree format",
+    ),
+}
+
+
+def _load_command(name: str) -> Command:
+    """Import and instantiate a command.
+
+    Args:
+        name: Command name
+
+    Returns:
+        Command instance
+
+    """
+    module_name, class_name, _ = _COMMANDS[name]
+    return getattr(importlib.import_module(module_name), class_name)()
 
 
 def main() -> None:
@@ -21,25 +56,29 @@ def main() -> None:
     )
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    # Register commands
-    commands = [
-        InitCommand(),
-        ListCommand(),
-        TreeCommand(),
-    ]
+    # Only the requested command is loaded and gets its full parser. The
+    # others (all of them without a known command, e.g. for --help) are
+    # listed by name and help text only.
+    argv = sys.argv[1:]
+    requested = argv[0] if argv and argv[0] in _COMMANDS else None
+    command = _load_command(requested) if requested is not None else None
 
-    for command in commands:
-        command.add_parser(subparsers)
+    for name, (_, _, help_text) in _COMMANDS.items():
+        if command is not None and name == requested:
+            command.add_parser(subparsers)
+        else:
+            subparsers.add_parser(name, help=help_text)
 
     args = parser.parse_args()
 
-    if args.command:
-        # Find and execute the command
-        for command in commands:
-            if command.name == args.command:
-                command.handle(args)
-                break
+    if args.command is not None:
+        if args.command != requested:
+            command = _load_command(args.command)
+        command.handle(args)
     else:
+        # Textual is only needed (and imported) for the TUI itself
+        from gmail_tui.app import main as app
+
         app()
 
 
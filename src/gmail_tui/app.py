@@ -6,7 +6,7 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 from typing import ClassVar
 
-from textual import on, work
+from textual import on
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal
 from textual.widgets import Footer, Header
@@ -95,11 +95,12 @@ class GmailTUI(App):
         """
         self.email_list.set_folder(message.folder)
 
-    @work(thread=True)
     def action_refresh(self) -> None:
         """Refresh action."""
+        # Each refresh runs in its own thread worker with its own pooled IMAP
+        # connection, so both round trips overlap
         self.folder_tree.action_refresh_directories()
-        self.email_list.action_refresh()
+        self.email_list.action_refresh_emails()
 
     def action_quit(self) -> None:
         """Quit the application."""
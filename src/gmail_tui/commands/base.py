@@ -18,10 +18,20 @@ class Command(ABC):
         pass
 
     @property
-    @abstractmethod
     def help(self) -> str:
-        """Get the command help text."""
-        pass
+        """Get the command help text.
+
+        The text is kept in the command table of gmail_tui, which lists the
+        commands without importing their modules.
+
+        Returns:
+            Help text of the command
+
+        """
+        # Imported here, gmail_tui imports this module while it is set up
+        from gmail_tui import _COMMANDS
+
+        return _COMMANDS[self.name][2]
 
     @abstractmethod
     def add_parser(self, subparsers: argparse._SubParsersAction) -> None:
@@ -7,7 +7,6 @@ SPDX-License-Identifier: GPL-3.0-or-later
 import argparse
 
 from gmail_tui.commands.base import Command
-from gmail_tui.config.init import init_config
 
 
 class InitCommand(Command):
@@ -18,11 +17,6 @@ class InitCommand(Command):
         """Get the command name."""
         return "init"
 
-    @property
-    def help(self) -> str:
-        """Get the command help text."""
-        return "Initialize Gmail TUI configuration"
-
     def add_parser(self, subparsers: argparse._SubParsersAction) -> None:
         """Add command parser to subparsers.
 
@@ -47,4 +41,7 @@ class InitCommand(Command):
             args: The parsed arguments
 
         """
+        # Imported here so that parsing arguments does not pay for it
+        from gmail_tui.config.init import init_config
+
         init_config(email=args.email, app_password=args.app_password)
@@ -7,7 +7,6 @@ SPDX-License-Identifier: GPL-3.0-or-later
 import argparse
 
 from gmail_tui.commands.base import Command
-from gmail_tui.list import list_emails
 
 
 class ListCommand(Command):
@@ -18,11 +17,6 @@ class ListCommand(Command):
         """Get the command name."""
         return "ls"
 
-    @property
-    def help(self) -> str:
-        """Get the command help text."""
-        return "List emails in a folder (outputs metadata in various formats)"
-
     def add_parser(self, subparsers: argparse._SubParsersAction) -> None:
         """Add command parser to subparsers.
 
@@ -59,4 +53,7 @@ class ListCommand(Command):
             args: The parsed arguments
 
         """
+        # Imported here so that parsing arguments does not pay for it
+        from gmail_tui.list import list_emails
+
         list_emails(args.folder, args.limit, args.format)
@@ -5,12 +5,79 @@ SPDX-License-Identifier: GPL-3.0-or-later
 """
 
 import argparse
+import json
+import logging
 import sys
+import time
+from pathlib import Path
 
 from gmail_tui.commands.base import Command
-from gmail_tui.config import get_config
-from gmail_tui.imap_tree import IMAPTree
-from gmail_tui.utils import get_imap_connection
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Seconds for which the cached folder list is used without asking the server
+FOLDER_CACHE_TTL = 3600
+
+
+def _folder_cache_file(email: str) -> Path:
+    """Get the file the folder list of an account is cached in.
+
+    Args:
+        email: Gmail address
+
+    Returns:
+        Path to the cache file
+
+    """
+    from xdg import xdg_cache_home
+
+    return xdg_cache_home() / "gmail-tui" / f"{email}-folders.json"
+
+
+def _load_cached_folders(cache_file: Path) -> list | None:
+    """Load a cached folder list if it is recent enough.
+
+    Args:
+        cache_file: Path to the cache file
+
+    Returns:
+        List of (flags, delimiter, name) folder entries, or None if the
+        cache is missing, outdated or unreadable
+
+    """
+    try:
+        if time.time() - cache_file.stat().st_mtime >= FOLDER_CACHE_TTL:
+            return None
+        return json.loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_folders(cache_file: Path, folders: list) -> None:
+    """Cache a folder list.
+
+    Args:
+        cache_file: Path to the cache file
+        folders: List of IMAP folder tuples (flags, delimiter, name)
+
+    """
+
+    def decode(value: bytes | str) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    entries = [
+        [[decode(flag) for flag in flags], decode(delimiter), decode(name)]
+        for flags, delimiter, name in folders
+    ]
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so readers never see a partial file
+        temp_file = cache_file.with_suffix(".json.tmp")
+        temp_file.write_text(json.dumps(entries))
+        temp_file.replace(cache_file)
+    except OSError as e:
+        logger.warning("Failed to cache folder list in %s: %s", cache_file, e)
 
 
 class TreeCommand(Command):
@@ -21,11 +88,6 @@ class TreeCommand(Command):
         """Get the command name."""
         return "tree"
 
-    @property
-    def help(self) -> str:
-        """Get the command help text."""
-        return "Display email folders in tree format"
-
     def add_parser(self, subparsers: argparse._SubParsersAction) -> None:
         """Add command parser to subparsers.
 
@@ -33,26 +95,42 @@ class TreeCommand(Command):
             subparsers: The subparsers object from ArgumentParser
 
         """
-        subparsers.add_parser(self.name, help=self.help)
+        parser = subparsers.add_parser(self.name, help=self.help)
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Fetch the folder list from the server instead of the cache",
+        )
 
-    def handle(self, _: argparse.Namespace) -> None:
+    def handle(self, args: argparse.Namespace) -> None:
         """Handle the command.
 
         Args:
-            _: The parsed arguments (unused)
+            args: The parsed arguments
 
         """
+        # Imported here so that parsing arguments does not pay for them
+        from gmail_tui.config import get_config
+        from gmail_tui.imap_tree import IMAPTree
+        from gmail_tui.utils import get_imap_connection
+
         config = get_config()
         try:
-            with get_imap_connection(
-                username=config.email, password=config.app_password
-            ) as client:
-                folders = client.list_folders()
-                if not folders:
-                    sys.stdout.write("No folders found\n")
-                    return
-
-                tree = IMAPTree(folders)
-                tree.print_tree()
-        except Exception as e:
-            sys.stderr.write(f"Error: {e!s}\n")
+            cache_file = _folder_cache_file(config.email)
+            folders = None if args.refresh else _load_cached_folders(cache_file)
+            if folders is None:
+                with get_imap_connection(
+                    username=config.email, password=config.app_password
+                ) as client:
+                    folders = client.list_folders()
+                if folders:
+                    _save_cached_folders(cache_file, folders)
+
+            if not folders:
+                sys.stdout.write("No folders found\n")
+                return
+
+            tree = IMAPTree(folders)
+            sys.stdout.write(tree.render())
+        except Exception:
+            logger.exception("Failed to display folder tree")
@@ -4,6 +4,6 @@ SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
 SPDX-License-Identifier: GPL-3.0-or-later
 """
 
-from .loader import get_config
+from .loader import get_config, invalidate_config
 
-__all__ = ["get_config"]
+__all__ = ["get_config", "invalidate_config"]
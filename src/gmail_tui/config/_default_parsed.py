@@ -0,0 +1,30 @@
+"""Parsed default configuration for Gmail TUI.
+
+Generated from default.yaml by scripts/generate_default_config.py, do not edit.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from typing import Any
+
+DEFAULT: dict[str, Any] = {
+    "gmail": {"email": "", "app_password": ""},
+    "bindings": {
+        "q": "quit",
+        "r": "refresh_directories",
+        "j": "next",
+        "k": "previous",
+        "g": "top",
+        "G": "bottom",
+        "o": "open",
+        "d": "delete",
+        "a": "archive",
+        "s": "star",
+        "m": "mark_read",
+        "/": "search",
+        "n": "next_result",
+        "N": "previous_result",
+        "?": "help",
+    },
+}
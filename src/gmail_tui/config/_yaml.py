@@ -0,0 +1,44 @@
+"""YAML loading and dumping backed by libyaml when available.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from typing import IO, Any
+
+import yaml
+
+# Prefer the libyaml bindings, fall back to the pure-Python implementation
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+
+def safe_load(stream: str | bytes | IO) -> Any:
+    """Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream: YAML document or file object
+
+    Returns:
+        Parsed document
+
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream: IO | None = None, **kwargs: Any) -> str | None:
+    """Serialize data to YAML with the fastest available safe dumper.
+
+    Args:
+        data: Data to serialize
+        stream: File object to write to, or None to return a string
+        **kwargs: Additional arguments passed to yaml.dump
+
+    Returns:
+        YAML document if no stream is given, otherwise None
+
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
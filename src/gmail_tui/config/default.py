@@ -4,8 +4,12 @@ SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
 SPDX-License-Identifier: GPL-3.0-or-later
 """
 
+from collections.abc import Mapping
 from pathlib import Path
-from typing import TypedDict
+from types import MappingProxyType
+from typing import Any, TypedDict
+
+from ._default_parsed import DEFAULT
 
 
 class KeyBinding(TypedDict):
@@ -17,9 +21,59 @@ class KeyBinding(TypedDict):
 
 
 def load_default_config() -> str:
-    """Load default configuration from YAML file."""
+    """Load default configuration from YAML file.
+
+    Only needed to check the compiled form; at runtime the configuration is
+    taken from DEFAULT_CONFIG_PARSED instead.
+
+    Returns:
+        Contents of default.yaml
+
+    """
     config_path = Path(__file__).parent / "default.yaml"
     return config_path.read_text()
 
 
-DEFAULT_CONFIG = load_default_config()
+def _freeze(data: Any) -> Any:
+    """Recursively wrap dictionaries in read-only proxies.
+
+    Args:
+        data: Parsed configuration data
+
+    Returns:
+        Read-only view of the data
+
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in data.items()})
+    return data
+
+
+def _thaw(data: Any) -> Any:
+    """Recursively copy read-only mappings into plain dictionaries.
+
+    Args:
+        data: Read-only configuration data
+
+    Returns:
+        Mutable copy of the data
+
+    """
+    if isinstance(data, Mapping):
+        return {key: _thaw(value) for key, value in data.items()}
+    return data
+
+
+def copy_default_config() -> dict[str, Any]:
+    """Get a mutable copy of the default configuration.
+
+    Returns:
+        Default configuration data
+
+    """
+    return _thaw(DEFAULT_CONFIG_PARSED)
+
+
+# Parsed default configuration, shared read-only by all callers. It is compiled
+# from default.yaml ahead of time by scripts/generate_default_config.py.
+DEFAULT_CONFIG_PARSED: Mapping[str, Any] = _freeze(DEFAULT)
@@ -5,11 +5,18 @@ SPDX-License-Identifier: GPL-3.0-or-later
 """
 
 import logging
+import os
 
-import yaml
-from xdg import xdg_config_home
+from ._yaml import safe_dump
+from .default import copy_default_config
+from .loader import get_config_dirs
 
-from .default import DEFAULT_CONFIG
+# Shown before asking for the credentials, emitted as one log record
+_WELCOME = """Welcome to Gmail TUI configuration!
+Please enter your Gmail credentials.
+Note: For security reasons, you should use an App Password.
+You can generate one at: https://myaccount.google.com/apppasswords
+"""
 
 
 def init_config(
@@ -23,7 +30,7 @@ def init_config(
         app_password: Optional app password for non-interactive configuration
 
     """
-    config_dir = xdg_config_home() / "gmail-tui"
+    config_dir = get_config_dirs()[0]
     config_dir.mkdir(parents=True, exist_ok=True)
     config_file = config_dir / "config.yaml"
 
@@ -34,13 +41,7 @@ def init_config(
 
     # Get user input if not provided
     if email is None or app_password is None:
-        logging.info("Welcome to Gmail TUI configuration!")
-        logging.info("Please enter your Gmail credentials.")
-        logging.info("Note: For security reasons, you should use an App Password.")
-        logging.info(
-            "You can generate one at: https://myaccount.google.com/apppasswords"
-        )
-        logging.info("")
+        logging.info("%s", _WELCOME)
 
         email = input("Gmail address: ").strip() if email is None else email
         app_password = (
@@ -48,15 +49,34 @@ def init_config(
         )
 
     # Load default configuration
-    config = yaml.safe_load(DEFAULT_CONFIG)
+    config = copy_default_config()
 
     # Update with user credentials
     config["gmail"]["email"] = email
     config["gmail"]["app_password"] = app_password
 
-    # Write configuration
-    with config_file.open("w") as f:
-        yaml.dump(config, f, default_flow_style=False)
+    # Write configuration to a temporary file readable only by the user, then
+    # move it into place, so no partially written file is ever left behind.
+    # A stale temporary file is removed first, so the file is always newly
+    # created with the private mode.
+    data = safe_dump(config, default_flow_style=False).encode()
+    temp_file = config_file.with_suffix(".yaml.tmp")
+    temp_file.unlink(missing_ok=True)
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        temp_file.replace(config_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
 
-    logging.info("Configuration saved to %s", config_file)
-    logging.info("You can now start Gmail TUI with 'gmail-tui' command.")
+    logging.info(
+        "Configuration saved to %s\nYou can now start Gmail TUI with 'gmail-tui' "
+        "command.",
+        config_file,
+    )
@@ -5,37 +5,103 @@ SPDX-License-Identifier: GPL-3.0-or-later
 """
 
 import logging
+from functools import lru_cache
+from pathlib import Path
 
-import yaml
 from xdg import xdg_config_dirs, xdg_config_home
 
-from .default import DEFAULT_CONFIG
+from ._yaml import safe_load
+from .default import DEFAULT_CONFIG_PARSED
 from .types import Config
 
 _config: Config | None = None
 
 
+@lru_cache(maxsize=1)
+def get_config_dirs() -> tuple[Path, ...]:
+    """Get the directories searched for the configuration file.
+
+    The XDG base directories are resolved once per process.
+
+    Returns:
+        Configuration directories, the user's own directory first
+
+    """
+    return tuple(
+        config_dir / "gmail-tui"
+        for config_dir in [xdg_config_home(), *xdg_config_dirs()]
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_config_file(config_file: Path, _mtime_ns: int) -> Config | None:
+    """Load configuration from a file.
+
+    The modification time is part of the cache key, so the file is only
+    parsed again after it has been changed.
+
+    Args:
+        config_file: Path to the configuration file
+        _mtime_ns: Modification time of the file in nanoseconds
+
+    Returns:
+        Config: Configuration object, or None if the file is empty
+
+    """
+    # Let the YAML loader detect and decode the encoding itself
+    config_data = safe_load(config_file.read_bytes())
+    return Config(config_data) if config_data else None
+
+
+@lru_cache(maxsize=1)
+def _load_default_config() -> Config:
+    """Load the default configuration.
+
+    Returns:
+        Config: Configuration object
+
+    """
+    return Config(DEFAULT_CONFIG_PARSED)
+
+
+def invalidate_config() -> None:
+    """Forget the cached configuration and directories, so they are reloaded."""
+    global _config  # noqa: PLW0603
+    _config = None
+    get_config_dirs.cache_clear()
+
+
 def get_config() -> Config:
     """Load configuration from user config file or use default.
 
+    The configuration is loaded once per process; call invalidate_config()
+    to pick up changes made afterwards.
+
     Returns:
         Config: Configuration object
 
     """
+    global _config  # noqa: PLW0603
     if _config is not None:
         return _config
 
-    for config_dir in [xdg_config_home(), *xdg_config_dirs()]:
-        config_file = config_dir / "gmail-tui" / "config.yaml"
-        if config_file.exists():
-            try:
-                with config_file.open() as f:
-                    config_data = yaml.safe_load(f)
-                    if config_data:
-                        return Config(config_data)
-            except Exception as e:
-                logging.warning("Failed to load config from %s: %s", config_file, e)
-                continue
+    for config_dir in get_config_dirs():
+        config_file = config_dir / "config.yaml"
+        # A single stat both finds the file and provides the cache key; skip
+        # directories that are missing or cannot be searched
+        try:
+            mtime_ns = config_file.stat().st_mtime_ns
+        except OSError:
+            continue
+
+        try:
+            config = _load_config_file(config_file, mtime_ns)
+            if config is not None:
+                _config = config
+                return _config
+        except Exception as e:
+            logging.warning("Failed to load config from %s: %s", config_file, e)
 
     # If no valid user configuration is found, use default configuration
-    return Config(yaml.safe_load(DEFAULT_CONFIG))
+    _config = _load_default_config()
+    return _config
@@ -6,13 +6,24 @@ SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
 import sys
+from collections.abc import Mapping
 from typing import NamedTuple
 
+# Gmail settings that must be non-empty strings
+CREDENTIAL_FIELDS = ("email", "app_password")
+
+MISSING_CREDENTIALS_MESSAGE = (
+    "Gmail credentials not found in configuration.\n"
+    "Please run 'gmail-tui init' to set up your credentials."
+)
+
 
 class Config:
     """Configuration class."""
 
-    def __init__(self, data: dict) -> None:
+    __slots__ = ("app_password", "bindings", "email")
+
+    def __init__(self, data: Mapping) -> None:
         """Initialize configuration.
 
         Args:
@@ -22,7 +33,7 @@ class Config:
             ValueError: If configuration is invalid
 
         """
-        if not isinstance(data, dict):
+        if not isinstance(data, Mapping):
             raise ValueError("Configuration must be a dictionary")
 
         # Validate Gmail configuration
@@ -30,18 +41,11 @@ class Config:
             raise ValueError("Gmail configuration not found")
 
         gmail_config = data["gmail"]
-        if not isinstance(gmail_config.get("email"), str) or not gmail_config["email"]:
-            logging.error("Gmail credentials not found in configuration.")
-            logging.error("Please run 'gmail-tui init' to set up your credentials.")
-            sys.exit(1)
-
-        if (
-            not isinstance(gmail_config.get("app_password"), str)
-            or not gmail_config["app_password"]
-        ):
-            logging.error("Gmail credentials not found in configuration.")
-            logging.error("Please run 'gmail-tui init' to set up your credentials.")
-            sys.exit(1)
+        for field in CREDENTIAL_FIELDS:
+            value = gmail_config.get(field)
+            if not isinstance(value, str) or not value:
+                logging.error(MISSING_CREDENTIALS_MESSAGE)
+                sys.exit(1)
 
         self.email = gmail_config["email"]
         self.app_password = gmail_config["app_password"]
@@ -7,14 +7,34 @@ SPDX-License-Identifier: GPL-3.0-or-later
 import email.message
 from dataclasses import dataclass, field
 from datetime import datetime
-from email.header import decode_header
-from typing import Any
+from email.header import Header, decode_header
+from email.parser import BytesHeaderParser
+from functools import lru_cache
+from typing import Any, ClassVar
 
 from imapclient import IMAPClient
 
 ADDRESS_TUPLE_MIN_LENGTH = 4
 
+# Parser for message headers, shared by all messages since it keeps no state
+# between calls; parsing stops at the end of the headers
+_HEADER_PARSER = BytesHeaderParser()
 
+# FETCH data item for the headers that ENVELOPE does not include, and the key
+# of its data in the response; PEEK keeps the message from being marked seen
+HEADER_FIELDS_ITEM = "BODY.PEEK[HEADER.FIELDS (REFERENCES)]"
+HEADER_FIELDS_KEY = b"BODY[HEADER.FIELDS (REFERENCES)]"
+
+# FETCH data item for the whole message, and the key of its data
+FULL_MESSAGE_ITEM = "BODY.PEEK[]"
+FULL_MESSAGE_KEY = b"BODY[]"
+
+# Number of decoded header values to remember, the same senders and subjects
+# tend to show up again and again in a mailbox
+DECODE_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
 def decode_mime_words(s: str | None) -> str:
     """Decode MIME encoded-word strings.
 
@@ -27,18 +47,62 @@ def decode_mime_words(s: str | None) -> str:
     """
     if not s:
         return ""
+    # Plain headers without encoded words are returned as-is by decode_header
+    if "=?" not in s:
+        return s
+    parts = decode_header(s)
+    if all(charset is None for _, charset in parts):
+        # No valid encoded words after all, e.g. a stray "=?" in the text
+        return s
+    # decode_header joins adjacent words of the same charset, so characters
+    # split across encoded words are decoded as a whole
     result = []
-    for decoded_str, charset in decode_header(s):
-        if isinstance(decoded_str, bytes):
-            if charset:
-                result.append(decoded_str.decode(charset))
-            else:
-                result.append(decoded_str.decode())
-        else:
+    for decoded_str, charset in parts:
+        if not isinstance(decoded_str, bytes):
             result.append(decoded_str)
+            continue
+        try:
+            result.append(decoded_str.decode(charset or "utf-8", errors="replace"))
+        except LookupError:
+            # Unknown charset, decode as UTF-8 rather than failing
+            result.append(decoded_str.decode("utf-8", errors="replace"))
     return "".join(result)
 
 
+def _to_str(value: Any) -> str:
+    """Convert a value from IMAP data, which may be bytes, to a string.
+
+    Args:
+        value: Bytes or any other value
+
+    Returns:
+        Decoded string
+
+    """
+    return value.decode() if type(value) is bytes else str(value)
+
+
+def _header_to_str(value: str | Header) -> str:
+    """Convert a header value from a parsed message to a string.
+
+    Raw 8-bit header values are returned as Header objects, which cannot be
+    hashed; their bytes are decoded as UTF-8 instead.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Header value as a string
+
+    """
+    if isinstance(value, Header):
+        return "".join(
+            part.decode("utf-8", errors="replace") if isinstance(part, bytes) else part
+            for part, _ in decode_header(value)
+        )
+    return value
+
+
 def format_address_list(addresses: list | None) -> str | None:
     """Format an address list to a string representation.
 
@@ -54,44 +118,34 @@ def format_address_list(addresses: list | None) -> str | None:
 
     result = []
     for address in addresses:
-        # Handle different address formats
-        if (
-            hasattr(address, "name")
-            and hasattr(address, "mailbox")
-            and hasattr(address, "host")
-        ):
-            # Process Address objects
-            name = address.name
-            mailbox = address.mailbox
-            host = address.host
-        elif isinstance(address, list | tuple) and len(address) >= (
-            ADDRESS_TUPLE_MIN_LENGTH
-        ):
-            # Process tuple format (name, host_route, mailbox, host)
+        # Handle different address formats, most common first
+        if isinstance(address, list | tuple):
+            if len(address) < ADDRESS_TUPLE_MIN_LENGTH:
+                # Skip unrecognized address formats
+                continue
+            # Process tuple format (name, host_route, mailbox, host), which
+            # includes imapclient's Address named tuples
             name, _, mailbox, host = address
         else:
-            # Skip unrecognized address formats
-            continue
+            # Process other Address objects
+            try:
+                name, mailbox, host = address.name, address.mailbox, address.host
+            except AttributeError:
+                # Skip unrecognized address formats
+                continue
 
         parts = []
         if name:
-            decoded_name = decode_mime_words(
-                name.decode() if isinstance(name, bytes) else str(name)
-            )
+            decoded_name = decode_mime_words(_to_str(name))
             if " " in decoded_name:
                 parts.append(f'"{decoded_name}"')
             else:
                 parts.append(decoded_name)
 
-        email_address = ""
         if mailbox and host:
-            mb = mailbox.decode() if isinstance(mailbox, bytes) else mailbox
-            h = host.decode() if isinstance(host, bytes) else host
-            email_address = f"{mb}@{h}"
-            parts.append(f"<{email_address}>")
+            parts.append(f"<{_to_str(mailbox)}@{_to_str(host)}>")
         elif mailbox:
-            email_address = mailbox.decode() if isinstance(mailbox, bytes) else mailbox
-            parts.append(f"<{email_address}>")
+            parts.append(f"<{_to_str(mailbox)}>")
 
         if parts:
             result.append(" ".join(parts))
@@ -99,10 +153,43 @@ def format_address_list(addresses: list | None) -> str | None:
     return ", ".join(result) if result else None
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailMetadata:
     """Email metadata class."""
 
+    # (key, attribute) pairs of the fields in to_dict(), in output order
+    _FIELDS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("uid", "uid"),
+        ("internal_date", "internal_date"),
+        ("subject", "subject"),
+        ("from", "from_addr"),
+        ("to", "to_addr"),
+        ("cc", "cc_addr"),
+        ("bcc", "bcc_addr"),
+        ("date", "date"),
+        ("message_id", "message_id"),
+        ("in_reply_to", "in_reply_to"),
+        ("references", "references"),
+        ("content_type", "content_type"),
+        ("content_disposition", "content_disposition"),
+        ("size", "size"),
+        ("flags", "flags"),
+    )
+
+    # Headers read by from_message(): lowercase name -> (attribute, whether
+    # the value may contain MIME encoded words)
+    _HEADERS: ClassVar[dict[str, tuple[str, bool]]] = {
+        "subject": ("subject", True),
+        "from": ("from_addr", True),
+        "to": ("to_addr", True),
+        "cc": ("cc_addr", True),
+        "bcc": ("bcc_addr", True),
+        "date": ("date", False),
+        "message-id": ("message_id", False),
+        "in-reply-to": ("in_reply_to", False),
+        "references": ("references", False),
+    }
+
     uid: int
     internal_date: datetime
     subject: str | None = None
@@ -131,7 +218,8 @@ class EmailMetadata:
             EmailMetadata object
 
         """
-        message = email.message_from_bytes(data[b"RFC822"])
+        # Only the headers are needed, so skip parsing the (possibly large) body
+        message = _HEADER_PARSER.parsebytes(data[b"RFC822"])
         return cls.from_message(
             uid=uid,
             internal_date=data[b"INTERNALDATE"],
@@ -164,32 +252,23 @@ class EmailMetadata:
         """
         metadata = cls(uid=uid, internal_date=internal_date, size=size)
         if flags:
-            metadata.flags = [
-                flag.decode() if isinstance(flag, bytes) else str(flag)
-                for flag in flags
-            ]
-
-        # Basic fields
-        if message["subject"]:
-            metadata.subject = decode_mime_words(message["subject"])
-        if message["from"]:
-            metadata.from_addr = decode_mime_words(message["from"])
-        if message["to"]:
-            metadata.to_addr = decode_mime_words(message["to"])
-        if message["date"]:
-            metadata.date = message["date"]
-
-        # Optional fields
-        if message["cc"]:
-            metadata.cc_addr = decode_mime_words(message["cc"])
-        if message["bcc"]:
-            metadata.bcc_addr = decode_mime_words(message["bcc"])
-        if message["message-id"]:
-            metadata.message_id = message["message-id"]
-        if message["in-reply-to"]:
-            metadata.in_reply_to = message["in-reply-to"]
-        if message["references"]:
-            metadata.references = message["references"]
+            metadata.flags = [_to_str(flag) for flag in flags]
+
+        # Copy the known headers in a single pass over the header list. As
+        # with message[name], only the first occurrence of a header counts.
+        seen = set()
+        for name, value in message.items():
+            key = name.lower()
+            header = cls._HEADERS.get(key)
+            if header is None or key in seen:
+                continue
+            seen.add(key)
+            if value:
+                attribute, encoded = header
+                text = _header_to_str(value)
+                setattr(
+                    metadata, attribute, decode_mime_words(text) if encoded else text
+                )
 
         # Content-related fields
         metadata.content_type = message.get_content_type()
@@ -203,7 +282,8 @@ class EmailMetadata:
 
         Args:
             uid: Message UID
-            data: IMAP data containing ENVELOPE, INTERNALDATE and RFC822.SIZE
+            data: IMAP data containing ENVELOPE, INTERNALDATE and RFC822.SIZE,
+                and optionally the HEADER_FIELDS_ITEM headers
 
         Returns:
             EmailMetadata object
@@ -219,19 +299,12 @@ class EmailMetadata:
             uid=uid,
             internal_date=internal_date,
             size=size,
-            flags=[
-                flag.decode() if isinstance(flag, bytes) else str(flag)
-                for flag in flags
-            ],
+            flags=[_to_str(flag) for flag in flags],
         )
 
         # Process email headers
         if envelope.subject:
-            metadata.subject = decode_mime_words(
-                envelope.subject.decode()
-                if isinstance(envelope.subject, bytes)
-                else str(envelope.subject)
-            )
+            metadata.subject = decode_mime_words(_to_str(envelope.subject))
 
         # Process sender, recipients, etc.
         metadata.from_addr = format_address_list(envelope.from_)
@@ -241,25 +314,21 @@ class EmailMetadata:
 
         # Process date and message ID
         if envelope.date:
-            metadata.date = (
-                envelope.date.decode()
-                if isinstance(envelope.date, bytes)
-                else str(envelope.date)
-            )
+            metadata.date = _to_str(envelope.date)
 
         if envelope.message_id:
-            metadata.message_id = (
-                envelope.message_id.decode()
-                if isinstance(envelope.message_id, bytes)
-                else str(envelope.message_id)
-            )
+            metadata.message_id = _to_str(envelope.message_id)
 
         if envelope.in_reply_to:
-            metadata.in_reply_to = (
-                envelope.in_reply_to.decode()
-                if isinstance(envelope.in_reply_to, bytes)
-                else str(envelope.in_reply_to)
-            )
+            metadata.in_reply_to = _to_str(envelope.in_reply_to)
+
+        # Process headers that are not part of the envelope
+        header_data = data.get(HEADER_FIELDS_KEY)
+        if header_data:
+            message = _HEADER_PARSER.parsebytes(header_data)
+            if message["references"]:
+                # Unfold the header, which is often split over several lines
+                metadata.references = " ".join(message["references"].split())
 
         return metadata
 
@@ -279,8 +348,9 @@ class EmailMetadata:
         if folder:
             client.select_folder(folder)
 
-        data = client.fetch([self.uid], ["RFC822"])[self.uid]
-        return email.message_from_bytes(data[b"RFC822"])
+        # Unlike RFC822, BODY.PEEK[] does not mark the message as seen
+        data = client.fetch([self.uid], [FULL_MESSAGE_ITEM])[self.uid]
+        return email.message_from_bytes(data[FULL_MESSAGE_KEY])
 
     def to_dict(self) -> dict:
         """Convert to dictionary.
@@ -289,24 +359,10 @@ class EmailMetadata:
             Dictionary containing email metadata
 
         """
-        return {
-            k: v
-            for k, v in {
-                "uid": self.uid,
-                "internal_date": self.internal_date.isoformat(),
-                "subject": self.subject,
-                "from": self.from_addr,
-                "to": self.to_addr,
-                "cc": self.cc_addr,
-                "bcc": self.bcc_addr,
-                "date": self.date,
-                "message_id": self.message_id,
-                "in_reply_to": self.in_reply_to,
-                "references": self.references,
-                "content_type": self.content_type,
-                "content_disposition": self.content_disposition,
-                "size": self.size,
-                "flags": self.flags,
-            }.items()
-            if v is not None
-        }
+        result = {}
+        for key, attribute in self._FIELDS:
+            value = getattr(self, attribute)
+            if value is not None:
+                result[key] = value
+        result["internal_date"] = self.internal_date.isoformat()
+        return result
@@ -7,6 +7,12 @@ SPDX-License-Identifier: GPL-3.0-or-later
 import sys
 from collections import defaultdict
 
+# Connectors drawn in front of a folder, and the indentation of its children
+BRANCH = "├── "
+LAST_BRANCH = "└── "
+INDENT = "│   "
+LAST_INDENT = "    "
+
 
 class IMAPTree:
     """IMAP directory tree class."""
@@ -41,54 +47,70 @@ class IMAPTree:
 
     def _build_tree(
         self, folders: list[tuple[list[bytes], bytes, bytes]]
-    ) -> dict[str, set[str]]:
+    ) -> dict[str, list[tuple[str, str]]]:
         """Build a tree structure from folder list.
 
         Args:
             folders: List of IMAP folder tuples (flags, delimiter, name)
 
         Returns:
-            Dictionary representing the folder tree
+            Dictionary mapping each folder path to its children, as
+            (path, name) tuples sorted by path; root folders are the
+            children of ""
 
         """
-        tree: dict[str, set[str]] = defaultdict(set)
-        root_folders = set()
-
+        children: dict[str, dict[str, str]] = defaultdict(dict)
         for _, _, folder_name in folders:
             decoded_name = self._decode_flag(folder_name)
-            parts = decoded_name.split(self.delimiter)
+            parent, _, name = decoded_name.rpartition(self.delimiter)
+            children[parent][decoded_name] = name
 
-            if len(parts) == 1:
-                root_folders.add(decoded_name)
-            else:
-                parent = self.delimiter.join(parts[:-1])
-                tree[parent].add(decoded_name)
-
-        tree[""] = root_folders
+        # Sort once here, so the children are ready to be rendered in order
+        tree: dict[str, list[tuple[str, str]]] = defaultdict(list, {"": []})
+        for parent, entries in children.items():
+            tree[parent] = sorted(entries.items())
         return tree
 
+    def render(self) -> str:
+        """Render folder tree in tree-like format.
+
+        Returns:
+            Folder tree, one folder per line
+
+        """
+        lines: list[str] = []
+        # Depth-first walk with an explicit stack of
+        # (folder, name, prefix, is_last) tuples
+        stack: list[tuple[str, str, str, bool]] = []
+        self._push_children(stack, "", "")
+        while stack:
+            folder, name, prefix, is_last = stack.pop()
+            lines.append(f"{prefix}{LAST_BRANCH if is_last else BRANCH}{name}\n")
+            if folder in self.tree:
+                self._push_children(
+                    stack, folder, prefix + (LAST_INDENT if is_last else INDENT)
+                )
+        return "".join(lines)
+
     def print_tree(self) -> None:
         """Print folder tree in tree-like format."""
-        self._print_node()
+        sys.stdout.write(self.render())
+
+    def _push_children(
+        self, stack: list[tuple[str, str, str, bool]], root: str, prefix: str
+    ) -> None:
+        """Push the children of a folder onto the stack of folders to render.
 
-    def _print_node(self, root: str = "", prefix: str = "") -> None:
-        """Print a node and its children in tree-like format.
+        Children are pushed in reverse order, so they are popped sorted.
 
         Args:
-            root: Current root folder
-            prefix: Prefix for current line
+            stack: Stack of (folder, name, prefix, is_last) tuples
+            root: Parent folder
+            prefix: Prefix for the lines of the children
 
         """
-        folders = sorted(self.tree[root])
-        for i, folder in enumerate(folders):
-            is_last = i == len(folders) - 1
-            if root == "":
-                current = folder
-            else:
-                current = folder.split(self.delimiter)[-1]
-
-            output = f"{prefix}{'└── ' if is_last else '├── '}{current}"
-            sys.stdout.write(f"{output}\n")
-
-            if folder in self.tree:
-                self._print_node(folder, prefix + ("    " if is_last else "│   "))
+        folders = self.tree[root]
+        last = len(folders) - 1
+        for i in range(last, -1, -1):
+            folder, name = folders[i]
+            stack.append((folder, name, prefix, i == last))
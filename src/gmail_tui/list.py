@@ -4,17 +4,25 @@ SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
 SPDX-License-Identifier: GPL-3.0-or-later
 """
 
+import io
 import json
 import sys
+from collections.abc import Callable, Iterable
 from enum import Enum, auto
+from typing import TextIO
 
-import toml
 import yaml
 
 from gmail_tui.config import get_config
 from gmail_tui.email import EmailMetadata
 from gmail_tui.utils import fetch_email_metadata, get_imap_connection
 
+# orjson is optional, it is only used to speed up JSON output
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class OutputFormat(Enum):
     """Output format enum."""
@@ -37,16 +45,117 @@ class OutputFormat(Enum):
             ValueError: If format string is invalid
 
         """
+        # Look the member up by name, the enum keeps its own name table
         try:
-            return {
-                "json": cls.JSON,
-                "yaml": cls.YAML,
-                "toml": cls.TOML,
-            }[s.lower()]
+            return cls[s.upper()]
         except KeyError as err:
             raise ValueError(f"Invalid format: {s}") from err
 
 
+def _dump_json(data: dict) -> str:
+    """Serialize data to indented JSON, with orjson if it is installed.
+
+    Args:
+        data: Data to serialize
+
+    Returns:
+        JSON document
+
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _write_json(emails: Iterable[EmailMetadata], fp: TextIO) -> None:
+    """Write email metadata list as JSON, one email at a time.
+
+    Args:
+        emails: Email metadata
+        fp: Text stream to write to
+
+    """
+    separator = "[\n"
+    for email in emails:
+        # Indent the item by one level, as an element of the list
+        item = _dump_json(email.to_dict())
+        fp.write(separator + "  " + item.replace("\n", "\n  "))
+        separator = ",\n"
+    fp.write("[]" if separator == "[\n" else "\n]")
+
+
+def _write_yaml(emails: Iterable[EmailMetadata], fp: TextIO) -> None:
+    """Write email metadata list as YAML, one email at a time.
+
+    Args:
+        emails: Email metadata
+        fp: Text stream to write to
+
+    """
+    empty = True
+    for email in emails:
+        # Not libyaml's CSafeDumper: it escapes characters outside the BMP,
+        # such as emoji, even with allow_unicode
+        fp.write(
+            yaml.safe_dump(
+                [email.to_dict()],
+                allow_unicode=True,
+                sort_keys=False,
+                default_flow_style=False,
+            )
+        )
+        empty = False
+    if empty:
+        fp.write("[]\n")
+
+
+def _write_toml(emails: Iterable[EmailMetadata], fp: TextIO) -> None:
+    """Write email metadata list as TOML.
+
+    Args:
+        emails: Email metadata
+        fp: Text stream to write to
+
+    """
+    # Imported here, it is only needed for TOML output
+    import toml
+
+    # The TOML encoder cannot write a document piecewise
+    fp.write(toml.dumps({"emails": [email.to_dict() for email in emails]}))
+
+
+# Writer of each output format
+_WRITERS: dict[OutputFormat, Callable[[Iterable[EmailMetadata], TextIO], None]] = {
+    OutputFormat.JSON: _write_json,
+    OutputFormat.YAML: _write_yaml,
+    OutputFormat.TOML: _write_toml,
+}
+
+
+def write_output(
+    emails: Iterable[EmailMetadata], output_format: OutputFormat, fp: TextIO
+) -> None:
+    """Write email metadata list in specified format.
+
+    JSON and YAML output is written one email at a time, so the whole
+    document is never held in memory at once.
+
+    Args:
+        emails: Email metadata
+        output_format: Output format
+        fp: Text stream to write to
+
+    Raises:
+        ValueError: If the output format is not supported
+
+    """
+    try:
+        writer = _WRITERS[output_format]
+    except KeyError as err:
+        raise ValueError(f"Unsupported format: {output_format}") from err
+    writer(emails, fp)
+
+
 def format_output(emails: list[EmailMetadata], output_format: OutputFormat) -> str:
     """Format email metadata list in specified format.
 
@@ -58,17 +167,9 @@ def format_output(emails: list[EmailMetadata], output_format: OutputFormat) -> s
         Formatted string
 
     """
-    # Convert emails to list of dicts
-    data = [email.to_dict() for email in emails]
-
-    if output_format == OutputFormat.JSON:
-        return json.dumps(data, indent=2, ensure_ascii=False)
-    elif output_format == OutputFormat.YAML:
-        return yaml.dump(data, allow_unicode=True, sort_keys=False)
-    elif output_format == OutputFormat.TOML:
-        return toml.dumps({"emails": data})
-
-    raise ValueError(f"Unsupported format: {output_format}")
+    output = io.StringIO()
+    write_output(emails, output_format, output)
+    return output.getvalue()
 
 
 def list_emails(folder: str, limit: int = 20, output_format: str = "json") -> None:
@@ -100,8 +201,8 @@ def list_emails(folder: str, limit: int = 20, output_format: str = "json") -> No
                 return
 
             # Format and print output
-            formatted_output = format_output(emails, fmt)
-            sys.stdout.write(f"{formatted_output}\n")
+            write_output(emails, fmt, sys.stdout)
+            sys.stdout.write("\n")
     except ValueError as e:
         sys.stderr.write(f"Error: {e!s}\n")
     except Exception as e:
@@ -9,6 +9,7 @@ from .imap import (
     close_imap_connection,
     connect_imap,
     fetch_email_metadata,
+    fetch_in_batches,
     get_imap_connection,
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "close_imap_connection",
     "connect_imap",
     "fetch_email_metadata",
+    "fetch_in_batches",
     "get_imap_connection",
 ]
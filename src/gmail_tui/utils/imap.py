@@ -4,23 +4,92 @@ SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
 SPDX-License-Identifier: GPL-3.0-or-later
 """
 
+import atexit
+import hashlib
 import logging
+import queue
+import threading
+import time
+from collections.abc import Sequence
 from typing import Any
 
 from imapclient import IMAPClient
 
-from gmail_tui.email import EmailMetadata
+from gmail_tui.email import HEADER_FIELDS_ITEM, EmailMetadata
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 # Global connection pool to reuse IMAP connections
-# Key: (username, password), Value: IMAPClient instance
-_imap_connections: dict[tuple[str, str], IMAPClient] = {}
+# Key: (username, password digest), Value: queue of idle IMAPClient instances, each
+# with the time.monotonic() time at which it was returned to the pool
+_imap_connections: dict[
+    tuple[str, str], queue.SimpleQueue[tuple[IMAPClient, float]]
+] = {}
+_imap_connections_lock = threading.Lock()
+
+# Connections idle for longer than this many seconds are checked with NOOP
+# before reuse; the server is unlikely to have dropped more recently used ones
+NOOP_IDLE_SECONDS = 60
+
+# Maximum number of messages requested by a single FETCH command, larger
+# requests may exceed the command length limit of the server
+FETCH_BATCH_SIZE = 200
+
+
+def _connection_key(username: str, password: str) -> tuple[str, str]:
+    """Get the pool key of an account.
+
+    The password is only kept as a digest, so the pool does not hold on to
+    it in plain text.
+
+    Args:
+        username: Gmail address
+        password: App password for Gmail
+
+    Returns:
+        Username and password digest
+
+    """
+    return username, hashlib.blake2b(password.encode(), digest_size=16).hexdigest()
+
+
+def _get_idle_connections(
+    connection_key: tuple[str, str],
+) -> queue.SimpleQueue[tuple[IMAPClient, float]]:
+    """Get the queue of idle connections for an account.
+
+    Args:
+        connection_key: Pool key of the account, from _connection_key()
+
+    Returns:
+        Queue of idle IMAPClient instances and the times they were returned
+
+    """
+    with _imap_connections_lock:
+        idle = _imap_connections.get(connection_key)
+        if idle is None:
+            idle = _imap_connections[connection_key] = queue.SimpleQueue()
+        return idle
+
+
+def _logout(client: IMAPClient) -> None:
+    """Log out from an IMAP connection, ignoring errors.
+
+    Args:
+        client: IMAPClient object
+
+    """
+    try:
+        client.logout()
+    except Exception as e:
+        # Log but ignore errors during logout
+        # This is intentional as we're cleaning up resources
+        logger.debug(f"Error during IMAP logout (ignored): {e}")
 
 
 class IMAPConnectionManager:
-    """Context manager wrapper for IMAPClient connections from the pool."""
+    """Context manager that checks a connection out of the pool."""
 
     def __init__(self, username: str, password: str):
         """Initialize the connection manager.
@@ -31,29 +100,66 @@ class IMAPConnectionManager:
 
         """
         self.username = username
+        # Kept only for the lifetime of this context, to log in when the pool
+        # has no idle connection
         self.password = password
+        self.connection_key = _connection_key(username, password)
         self.client = None
 
     def __enter__(self) -> IMAPClient:
         """Enter the context and return a client connection.
 
+        An idle connection is taken from the pool if a live one is available,
+        otherwise a new connection is opened. Only connections that have been
+        idle for more than NOOP_IDLE_SECONDS are checked with a NOOP round
+        trip. The connection is used by this context only until it exits.
+
         Returns:
             IMAPClient: An IMAP client connection from the pool
 
         """
-        self.client = connect_imap(self.username, self.password)
-        return self.client
+        idle = _get_idle_connections(self.connection_key)
+        while True:
+            try:
+                client, released = idle.get_nowait()
+            except queue.Empty:
+                client = connect_imap(self.username, self.password)
+                break
+
+            if time.monotonic() - released <= NOOP_IDLE_SECONDS:
+                break
+
+            # Check if the connection is still alive
+            try:
+                client.noop()
+                break
+            except Exception:
+                # Connection is dead, drop it and try the next one
+                _logout(client)
+
+        self.client = client
+        return client
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Exit the context without closing the connection."""
-        # We don't logout here, as connections are managed by the pool
-        # Note: The connection remains in the pool for future use
-        pass
+        """Exit the context and return the connection to the pool."""
+        client, self.client = self.client, None
+        if client is None:
+            return
+
+        if exc_type is not None:
+            # The connection may be left in an unknown state, do not reuse it
+            _logout(client)
+            return
+
+        _get_idle_connections(self.connection_key).put((client, time.monotonic()))
 
 
 def connect_imap(username: str, password: str) -> IMAPClient:
     """Connect to Gmail IMAP server.
 
+    The connection is not pooled; use get_imap_connection to reuse
+    connections.
+
     Args:
         username: Gmail address
         password: App password for Gmail
@@ -62,25 +168,8 @@ def connect_imap(username: str, password: str) -> IMAPClient:
         IMAPClient object
 
     """
-    # Check if connection exists in the pool
-    connection_key = (username, password)
-    if connection_key in _imap_connections:
-        client = _imap_connections[connection_key]
-        # Check if the connection is still alive
-        try:
-            # Perform a simple operation to check connection
-            client.noop()
-            return client
-        except Exception:
-            # Connection is dead, remove it from the pool
-            del _imap_connections[connection_key]
-
-    # Create new connection
     client = IMAPClient("imap.gmail.com")
     client.login(username, password)
-
-    # Store in connection pool
-    _imap_connections[connection_key] = client
     return client
 
 
@@ -98,35 +187,72 @@ def get_imap_connection(username: str, password: str) -> IMAPConnectionManager:
     return IMAPConnectionManager(username, password)
 
 
+def _drain(idle: queue.SimpleQueue[tuple[IMAPClient, float]]) -> None:
+    """Log out from all idle connections in a queue.
+
+    Args:
+        idle: Queue of idle IMAPClient instances and the times they were
+            returned
+
+    """
+    while True:
+        try:
+            client, _ = idle.get_nowait()
+        except queue.Empty:
+            return
+        _logout(client)
+
+
 def close_imap_connection(username: str, password: str) -> None:
-    """Close and remove an IMAP connection from the pool.
+    """Close and remove the idle IMAP connections of an account from the pool.
 
     Args:
         username: Gmail address
         password: App password for Gmail
 
     """
-    connection_key = (username, password)
-    if connection_key in _imap_connections:
-        try:
-            _imap_connections[connection_key].logout()
-        except Exception as e:
-            # Log but ignore errors during logout
-            # This is intentional as we're cleaning up resources
-            logger.debug(f"Error during IMAP logout (ignored): {e}")
-        del _imap_connections[connection_key]
+    with _imap_connections_lock:
+        idle = _imap_connections.pop(_connection_key(username, password), None)
+    if idle is not None:
+        _drain(idle)
 
 
 def close_all_imap_connections() -> None:
-    """Close all IMAP connections in the pool."""
-    for client in _imap_connections.values():
-        try:
-            client.logout()
-        except Exception as e:
-            # Log but ignore errors during logout
-            # This is intentional as we're cleaning up resources
-            logger.debug(f"Error during IMAP logout (ignored): {e}")
-    _imap_connections.clear()
+    """Close all idle IMAP connections in the pool."""
+    with _imap_connections_lock:
+        pools = list(_imap_connections.values())
+        _imap_connections.clear()
+    for idle in pools:
+        _drain(idle)
+
+
+# Log out from pooled connections left open when the process exits, e.g. after
+# a command line command
+atexit.register(close_all_imap_connections)
+
+
+def fetch_in_batches(
+    client: IMAPClient,
+    messages: Sequence[int],
+    data: list[str],
+    batch_size: int = FETCH_BATCH_SIZE,
+) -> dict[int, dict]:
+    """Fetch data of many messages with as few FETCH commands as possible.
+
+    Args:
+        client: IMAPClient object
+        messages: Message UIDs to fetch
+        data: Data items to fetch for each message
+        batch_size: Maximum number of messages per FETCH command
+
+    Returns:
+        Dictionary mapping message UIDs to their fetched data
+
+    """
+    result: dict[int, dict] = {}
+    for start in range(0, len(messages), batch_size):
+        result.update(client.fetch(messages[start : start + batch_size], data))
+    return result
 
 
 def fetch_email_metadata(
@@ -151,13 +277,21 @@ def fetch_email_metadata(
         search_criteria = ["ALL"]
     client.select_folder(folder)
 
-    # Search for messages
-    messages = client.search(search_criteria)
+    if client.has_capability("SORT"):
+        # Let the server sort the messages by arrival time, so only the
+        # newest ones are fetched
+        messages = client.sort(["REVERSE ARRIVAL"], search_criteria)[:limit]
+    else:
+        # Search for messages
+        messages = client.search(search_criteria)
 
     # Optimization: only fetch email metadata, not the full content
-    # Use ENVELOPE for basic info, RFC822.SIZE for size, INTERNALDATE for date
-    fetch_data = client.fetch(
-        messages, ["ENVELOPE", "INTERNALDATE", "RFC822.SIZE", "FLAGS"]
+    # Use ENVELOPE for basic info, RFC822.SIZE for size, INTERNALDATE for date,
+    # and fetch the few headers missing from ENVELOPE separately
+    fetch_data = fetch_in_batches(
+        client,
+        messages,
+        ["ENVELOPE", "INTERNALDATE", "RFC822.SIZE", "FLAGS", HEADER_FIELDS_ITEM],
     )
 
     # Sort messages by date in descending order
@@ -13,7 +13,7 @@ from textual.widget import Widget
 from textual.widgets import DataTable
 
 from gmail_tui.email import EmailMetadata
-from gmail_tui.utils.imap import connect_imap, fetch_email_metadata
+from gmail_tui.utils.imap import fetch_email_metadata, get_imap_connection
 
 # Constants for display formatting
 MAX_SENDER_LENGTH = 30
@@ -167,19 +167,15 @@ class EmailList(Widget):
             return
 
         # Connect to IMAP server - connection will be reused from pool if available
-        client = connect_imap(username=self.email, password=self.app_password)
-
-        try:
+        with get_imap_connection(
+            username=self.email, password=self.app_password
+        ) as client:
             # Get email list
             emails = fetch_email_metadata(client, self.current_folder)
 
-            # Post update message
-            self.post_message(self.EmailsUpdated(emails))
-        except Exception:
-            # No need to close the connection as it's managed by the connection pool
-            raise
+        # Post update message
+        self.post_message(self.EmailsUpdated(emails))
 
-    @work(thread=True)
     def action_refresh(self) -> None:
         """Refresh action for the app-wide refresh command."""
         self.action_refresh_emails()
@@ -15,7 +15,7 @@ from textual.widgets.tree import TreeNode
 
 from gmail_tui.config import get_config
 from gmail_tui.imap_tree import IMAPTree
-from gmail_tui.utils.imap import connect_imap
+from gmail_tui.utils.imap import get_imap_connection
 
 
 class FolderTree(Widget):
@@ -38,6 +38,11 @@ class FolderTree(Widget):
         ("r", "refresh_directories", "Refresh"),
     ]
 
+    # Binding descriptions by action name, for keys set in the configuration
+    ACTION_DESCRIPTIONS: ClassVar[dict[str, str]] = {
+        action_name: description for (_, action_name, description) in BINDINGS
+    }
+
     class FolderSelected(Message):
         """Message sent when a folder is selected."""
 
@@ -73,16 +78,11 @@ class FolderTree(Widget):
         self.email: str = ""
         self.app_password: str = ""
 
-        actions = {
-            key: (action_name, description)
-            for (key, action_name, description) in self.BINDINGS
-        }
-
         for key, action_name in get_config().bindings.items():
-            if action_name not in actions:
+            description = self.ACTION_DESCRIPTIONS.get(action_name)
+            if description is None:
                 continue
-            (name, description) = actions[action_name]
-            super().bind(key, name, description=description)
+            self._bindings.bind(key, action_name, description=description)
 
     def set_credentials(self, email: str, app_password: str) -> None:
         """Set IMAP credentials.
@@ -142,13 +142,7 @@ class FolderTree(Widget):
         if parent is None:
             parent = self.tree_widget.root
 
-        folders = sorted(self.tree_data.tree[root])
-        for folder in folders:
-            if root == "":
-                label = folder
-            else:
-                label = folder.split(self.tree_data.delimiter)[-1]
-
+        for folder, label in self.tree_data.tree[root]:
             # Check if folder has children
             has_children = folder in self.tree_data.tree and bool(
                 self.tree_data.tree[folder]
@@ -194,17 +188,14 @@ class FolderTree(Widget):
             return
 
         # Connect to IMAP server - connection will be reused from pool if available
-        client = connect_imap(username=self.email, password=self.app_password)
-
-        try:
+        with get_imap_connection(
+            username=self.email, password=self.app_password
+        ) as client:
             # Get folder list
             folders = client.list_folders()
 
-            # Post update message
-            self.post_message(self.FoldersUpdated(folders))
-        except Exception:
-            # No need to close the connection as it's managed by the connection pool
-            raise
+        # Post update message
+        self.post_message(self.FoldersUpdated(folders))
 
     def on_mount(self) -> None:
         """Handle widget mount event."""
@@ -9,6 +9,7 @@ This approach ensures that tests remain valid even when internal implementations
 as long as the public interfaces and expected behaviors remain the same.
 """
 
+import json
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
@@ -66,7 +67,7 @@ def test_list_command_handle(folder, limit, format_name):
     args.format = format_name
 
     # Mock the list_emails function
-    with patch("gmail_tui.commands.list.list_emails") as mock_list_emails:
+    with patch("gmail_tui.list.list_emails") as mock_list_emails:
         # Call handle method
         list_command.handle(args)
 
@@ -219,3 +220,60 @@ def test_list_emails_output_formats(mock_config, mock_imap_client, output_format
 
         # Verify output was written to stdout
         assert mock_stdout_write.call_count >= 1
+
+
+def test_list_emails_json_output(mock_config, mock_imap_client):
+    """Test that streamed JSON output forms a single valid document."""
+    # Import module
+    from gmail_tui.list import list_emails
+
+    mock_imap_client.search.return_value = [1, 2]
+
+    from_addr = (b"Sender Name", b"", b"sender", b"example.com")
+    to_addr = (b"Recipient", b"", b"user", b"example.com")
+
+    mock_imap_client.fetch.return_value = {
+        uid: {
+            b"ENVELOPE": create_envelope(
+                f"Test Email {uid}".encode(), from_addr, to_addr
+            ),
+            b"RFC822.SIZE": 1024,
+            b"INTERNALDATE": datetime(2023, 1, uid),
+            b"FLAGS": (),
+        }
+        for uid in (1, 2)
+    }
+
+    # Mock functions
+    with (
+        patch("gmail_tui.list.get_config", return_value=mock_config),
+        patch("gmail_tui.list.get_imap_connection") as mock_get_imap_connection,
+        patch("sys.stdout.write") as mock_stdout_write,
+    ):
+        # Set up connection mock
+        mock_get_imap_connection.return_value.__enter__.return_value = mock_imap_client
+
+        # Call function
+        list_emails("INBOX", 10, "json")
+
+        # Verify the pieces written to stdout add up to the expected document
+        output = "".join(call.args[0] for call in mock_stdout_write.call_args_list)
+        emails = json.loads(output)
+        assert [email["subject"] for email in emails] == [
+            "Test Email 2",
+            "Test Email 1",
+        ]
+
+
+def test_format_output_yaml_non_bmp() -> None:
+    """Test that characters outside the BMP are written as-is in YAML."""
+    from gmail_tui.email import EmailMetadata
+    from gmail_tui.list import OutputFormat, format_output
+
+    email = EmailMetadata(
+        uid=1, internal_date=datetime(2023, 1, 1), subject="Big sale \U0001f389 today"
+    )
+
+    output = format_output([email], OutputFormat.YAML)
+
+    assert "subject: Big sale \U0001f389 today\n" in output
@@ -11,6 +11,13 @@ import pytest
 from gmail_tui.commands.tree import TreeCommand
 
 
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep the folder cache in a temporary directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+
 @pytest.fixture
 def tree_command():
     """Return a tree command instance for testing."""
@@ -32,10 +39,8 @@ def test_tree_command_handle(tree_command, mock_config, mock_imap_client):
 
     # Mock functions
     with (
-        patch("gmail_tui.commands.tree.get_config", return_value=mock_config),
-        patch(
-            "gmail_tui.commands.tree.get_imap_connection"
-        ) as mock_get_imap_connection,
+        patch("gmail_tui.config.get_config", return_value=mock_config),
+        patch("gmail_tui.utils.get_imap_connection") as mock_get_imap_connection,
         patch("sys.stdout.write") as mock_stdout_write,
     ):
         # Set up connection mock
@@ -64,10 +69,8 @@ def test_tree_command_empty_folders(tree_command, mock_config, mock_imap_client)
 
     # Mock functions
     with (
-        patch("gmail_tui.commands.tree.get_config", return_value=mock_config),
-        patch(
-            "gmail_tui.commands.tree.get_imap_connection"
-        ) as mock_get_imap_connection,
+        patch("gmail_tui.config.get_config", return_value=mock_config),
+        patch("gmail_tui.utils.get_imap_connection") as mock_get_imap_connection,
         patch("sys.stdout.write") as mock_stdout_write,
     ):
         # Set up connection mock
@@ -81,15 +84,12 @@ def test_tree_command_empty_folders(tree_command, mock_config, mock_imap_client)
         mock_stdout_write.assert_called_once_with("No folders found\n")
 
 
-def test_tree_command_connection_error(tree_command, mock_config):
+def test_tree_command_connection_error(tree_command, mock_config, caplog):
     """Test error handling for connection issues."""
     # Mock functions
     with (
-        patch("gmail_tui.commands.tree.get_config", return_value=mock_config),
-        patch(
-            "gmail_tui.commands.tree.get_imap_connection"
-        ) as mock_get_imap_connection,
-        patch("sys.stderr.write") as mock_stderr_write,
+        patch("gmail_tui.config.get_config", return_value=mock_config),
+        patch("gmail_tui.utils.get_imap_connection") as mock_get_imap_connection,
     ):
         # Set connection to raise exception
         mock_get_imap_connection.side_effect = Exception("Connection error")
@@ -98,8 +98,10 @@ def test_tree_command_connection_error(tree_command, mock_config):
         args = MagicMock()
         tree_command.handle(args)
 
-        # Verify error message was written
-        mock_stderr_write.assert_called_once_with("Error: Connection error\n")
+        # Verify the error was logged along with its traceback
+        (record,) = caplog.records
+        assert record.levelname == "ERROR"
+        assert record.exc_info[1] is mock_get_imap_connection.side_effect
 
 
 def test_tree_command_nested_folders(tree_command, mock_config, mock_imap_client):
@@ -118,10 +120,8 @@ def test_tree_command_nested_folders(tree_command, mock_config, mock_imap_client
 
     # Mock functions
     with (
-        patch("gmail_tui.commands.tree.get_config", return_value=mock_config),
-        patch(
-            "gmail_tui.commands.tree.get_imap_connection"
-        ) as mock_get_imap_connection,
+        patch("gmail_tui.config.get_config", return_value=mock_config),
+        patch("gmail_tui.utils.get_imap_connection") as mock_get_imap_connection,
         patch("sys.stdout.write") as mock_stdout_write,
     ):
         # Set up connection mock
@@ -131,5 +131,42 @@ def test_tree_command_nested_folders(tree_command, mock_config, mock_imap_client
         args = MagicMock()
         tree_command.handle(args)
 
-        # Verify output was written (at least once, as each folder prints a line)
-        assert mock_stdout_write.call_count >= 1
+        # Verify the whole tree was written at once
+        mock_stdout_write.assert_called_once_with(
+            "├── Personal\n"
+            "│   ├── Family\n"
+            "│   └── Friends\n"
+            "└── Work\n"
+            "    ├── Meetings\n"
+            "    └── Projects\n"
+            "        ├── ProjectA\n"
+            "        └── ProjectB\n"
+        )
+
+
+def test_tree_command_folder_cache(tree_command, mock_config, mock_imap_client):
+    """Test that the folder list is cached between runs unless refreshed."""
+    mock_imap_client.list_folders.return_value = [
+        ([b"\\HasNoChildren"], b"/", "INBOX"),
+        ([b"\\HasNoChildren"], b"/", "Sent"),
+    ]
+
+    with (
+        patch("gmail_tui.config.get_config", return_value=mock_config),
+        patch("gmail_tui.utils.get_imap_connection") as mock_get_imap_connection,
+        patch("sys.stdout.write") as mock_stdout_write,
+    ):
+        mock_get_imap_connection.return_value.__enter__.return_value = mock_imap_client
+
+        # The first run fetches the folders, the second one reads the cache
+        tree_command.handle(MagicMock(refresh=False))
+        first_output = mock_stdout_write.call_args_list.copy()
+        mock_stdout_write.reset_mock()
+        tree_command.handle(MagicMock(refresh=False))
+        mock_imap_client.list_folders.assert_called_once()
+        assert mock_stdout_write.call_args_list == first_output
+
+        # Refreshing fetches the folders again
+        mock_imap_client.list_folders.reset_mock()
+        tree_command.handle(MagicMock(refresh=True))
+        mock_imap_client.list_folders.assert_called_once()
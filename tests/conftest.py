@@ -39,4 +39,5 @@ def mock_imap_client():
     client.logout.return_value = b"OK"
     client.select_folder.return_value = {"EXISTS": 10}
     client.search.return_value = [1, 2, 3]
+    client.has_capability.return_value = False
     return client
@@ -0,0 +1,45 @@
+"""Tests for the trailing whitespace checker script.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).parent.parent / "scripts" / "check_trailing_whitespace.py"
+_spec = importlib.util.spec_from_file_location("check_trailing_whitespace", _SCRIPT)
+check_trailing_whitespace = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_trailing_whitespace)
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_find_text_files_skips_special_files(tmp_path: Path, threads: int) -> None:
+    """Test that only regular files are found, whichever walker is used."""
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.py").write_text("b = 2\n")
+    (tmp_path / "broken.py").symlink_to(tmp_path / "nonexistent")
+    os.mkfifo(tmp_path / "fifo.py")
+
+    files = check_trailing_whitespace.find_text_files(
+        tmp_path, (".py",), frozenset(), max_size=1024, threads=threads
+    )
+
+    assert files == [tmp_path / "a.py", tmp_path / "sub" / "b.py"]
+
+
+def test_check_and_fix_agree_on_line_breaks(tmp_path: Path) -> None:
+    """Test that LF, CRLF and lone CR all end lines when checking and fixing."""
+    file_path = tmp_path / "mixed.txt"
+    file_path.write_bytes(b"a \rb\rc\t\r\nd\n\re \n")
+
+    issues = check_trailing_whitespace.check_file_for_trailing_whitespace(file_path)
+
+    assert issues == [(1, "a "), (3, "c\t"), (6, "e ")]
+    fixed = check_trailing_whitespace.remove_trailing_whitespace(file_path)
+    assert fixed == len(issues)
+    assert file_path.read_bytes() == b"a\rb\rc\r\nd\n\re\n"
@@ -5,6 +5,7 @@ SPDX-License-Identifier: GPL-3.0-or-later
 """
 
 import os
+import stat
 import sys
 import tempfile
 from collections.abc import Generator
@@ -13,8 +14,9 @@ from pathlib import Path
 import pytest
 import yaml
 
+from gmail_tui.config.default import copy_default_config, load_default_config
 from gmail_tui.config.init import init_config
-from gmail_tui.config.loader import get_config
+from gmail_tui.config.loader import get_config, invalidate_config
 from gmail_tui.config.types import Config
 
 
@@ -32,7 +34,9 @@ def temp_config_dir() -> Generator[Path]:
         original_xdg_config_home = os.environ.get("XDG_CONFIG_HOME")
         # Set test configuration directory
         os.environ["XDG_CONFIG_HOME"] = str(temp_path)
+        invalidate_config()
         yield temp_path
+        invalidate_config()
         # Restore original environment variable
         if original_xdg_config_home is None:
             os.environ.pop("XDG_CONFIG_HOME", None)
@@ -86,6 +90,31 @@ def test_load_user_config(temp_config_dir: Path) -> None:
     assert config.app_password == "test-password"  # noqa: S105
 
 
+def test_unsearchable_config_dir(
+    temp_config_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that configuration directories that cannot be searched are skipped."""
+    config_dir = temp_config_dir / "gmail-tui"
+    config_dir.mkdir(parents=True)
+    with (config_dir / "config.yaml").open("w") as f:
+        yaml.dump({"gmail": {"email": "test@gmail.com", "app_password": "x"}}, f)
+
+    unsearchable = temp_config_dir / "unsearchable"
+    path_stat = Path.stat
+
+    def stat_or_deny(path: Path, **kwargs) -> os.stat_result:
+        if unsearchable in path.parents:
+            raise PermissionError(13, "Permission denied", str(path))
+        return path_stat(path, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", stat_or_deny)
+    monkeypatch.setattr(
+        "gmail_tui.config.loader.get_config_dirs", lambda: (unsearchable, config_dir)
+    )
+
+    assert get_config().email == "test@gmail.com"
+
+
 def test_init_config(temp_config_dir: Path) -> None:
     """Test configuration initialization."""
     # Initialize config with test values
@@ -103,6 +132,47 @@ def test_init_config(temp_config_dir: Path) -> None:
         assert config["gmail"]["app_password"] == "test-password"  # noqa: S105
 
 
+def test_init_config_permissions(temp_config_dir: Path) -> None:
+    """Test that the initialized configuration is only readable by the user."""
+    init_config(email="test@gmail.com", app_password="test-password")  # noqa: S106
+
+    config_dir = temp_config_dir / "gmail-tui"
+    mode = (config_dir / "config.yaml").stat().st_mode
+    assert stat.S_IMODE(mode) == stat.S_IRUSR | stat.S_IWUSR
+    assert not (config_dir / "config.yaml.tmp").exists()
+
+
+def test_init_config_stale_temp_file(temp_config_dir: Path) -> None:
+    """Test that a leftover world-readable temporary file is not reused."""
+    config_dir = temp_config_dir / "gmail-tui"
+    config_dir.mkdir(parents=True)
+    temp_file = config_dir / "config.yaml.tmp"
+    temp_file.write_text("stale")
+    temp_file.chmod(0o644)
+
+    init_config(email="test@gmail.com", app_password="test-password")  # noqa: S106
+
+    mode = (config_dir / "config.yaml").stat().st_mode
+    assert stat.S_IMODE(mode) == stat.S_IRUSR | stat.S_IWUSR
+    assert not temp_file.exists()
+
+
+def test_init_config_write_error(
+    temp_config_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that no file with the credentials is left behind on errors."""
+
+    def fail_fsync(_fd: int) -> None:
+        raise OSError(5, "Input/output error")
+
+    monkeypatch.setattr("gmail_tui.config.init.os.fsync", fail_fsync)
+
+    with pytest.raises(OSError, match="Input/output error"):
+        init_config(email="test@gmail.com", app_password="test-password")  # noqa: S106
+
+    assert list((temp_config_dir / "gmail-tui").iterdir()) == []
+
+
 def test_init_config_existing(temp_config_dir: Path) -> None:
     """Test configuration initialization with existing config."""
     # Create existing config
@@ -182,3 +252,31 @@ def test_cli_init_command(temp_config_dir: Path) -> None:
     finally:
         # Restore original sys.argv
         sys.argv = original_argv
+
+
+def test_load_config_after_change(temp_config_dir: Path) -> None:
+    """Test that an edited configuration file is loaded again once invalidated."""
+    config_dir = temp_config_dir / "gmail-tui"
+    config_dir.mkdir(parents=True)
+    config_file = config_dir / "config.yaml"
+
+    with config_file.open("w") as f:
+        yaml.dump({"gmail": {"email": "old@gmail.com", "app_password": "old"}}, f)
+    os.utime(config_file, ns=(0, 0))
+
+    assert get_config() is get_config()
+    assert get_config().email == "old@gmail.com"
+
+    with config_file.open("w") as f:
+        yaml.dump({"gmail": {"email": "new@gmail.com", "app_password": "new"}}, f)
+    os.utime(config_file, ns=(1, 1))
+
+    # The loaded configuration is kept until it is invalidated
+    assert get_config().email == "old@gmail.com"
+    invalidate_config()
+    assert get_config().email == "new@gmail.com"
+
+
+def test_default_config_compiled() -> None:
+    """Test that the compiled default configuration matches default.yaml."""
+    assert copy_default_config() == yaml.safe_load(load_default_config())
@@ -0,0 +1,161 @@
+"""Tests for Gmail TUI email metadata.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from imapclient.response_types import Address, Envelope
+
+from gmail_tui.email import (
+    FULL_MESSAGE_ITEM,
+    FULL_MESSAGE_KEY,
+    HEADER_FIELDS_KEY,
+    EmailMetadata,
+    decode_mime_words,
+    format_address_list,
+)
+
+
+def test_from_imap_data() -> None:
+    """Test creating metadata from a full RFC822 message."""
+    raw = (
+        b"From: =?utf-8?q?J=C3=B6rg?= <jorg@example.com>\r\n"
+        b"To: test@example.com\r\n"
+        b"Subject: =?utf-8?b?SGVsbG8gV29ybGQ=?=\r\n"
+        b"Message-ID: <1@example.com>\r\n"
+        b"References: <0@example.com>\r\n"
+        b"Content-Type: text/plain; charset=utf-8\r\n"
+        b"\r\n"
+        b"Body\r\n"
+    )
+    internal_date = datetime(2024, 1, 1, 12, 0, 0)
+
+    metadata = EmailMetadata.from_imap_data(
+        1,
+        {b"RFC822": raw, b"INTERNALDATE": internal_date, b"FLAGS": (b"\\Seen",)},
+    )
+
+    assert metadata.uid == 1
+    assert metadata.internal_date == internal_date
+    assert metadata.subject == "Hello World"
+    assert metadata.from_addr == "Jörg <jorg@example.com>"
+    assert metadata.to_addr == "test@example.com"
+    assert metadata.message_id == "<1@example.com>"
+    assert metadata.references == "<0@example.com>"
+    assert metadata.content_type == "text/plain"
+    assert metadata.size == len(raw)
+    assert metadata.flags == ["\\Seen"]
+
+
+def test_from_imap_data_raw_8bit_headers() -> None:
+    """Test that raw UTF-8 header values are decoded."""
+    raw = "Subject: café\r\nFrom: Jörg <jorg@example.com>\r\n\r\n".encode()
+
+    metadata = EmailMetadata.from_imap_data(
+        1, {b"RFC822": raw, b"INTERNALDATE": datetime(2024, 1, 1, 12, 0, 0)}
+    )
+
+    assert metadata.subject == "café"
+    assert metadata.from_addr == "Jörg <jorg@example.com>"
+    assert metadata.to_dict()["subject"] == "café"
+
+
+def test_from_imap_data_repeated_header() -> None:
+    """Test that the first occurrence of a repeated header is used."""
+    raw = (
+        b"subject: =?utf-8?q?First?=\r\n"
+        b"Subject: Second\r\n"
+        b"CC: cc@example.com\r\n"
+        b"X-Other: ignored\r\n"
+        b"\r\n"
+    )
+
+    metadata = EmailMetadata.from_imap_data(
+        1, {b"RFC822": raw, b"INTERNALDATE": datetime(2024, 1, 1, 12, 0, 0)}
+    )
+
+    assert metadata.subject == "First"
+    assert metadata.cc_addr == "cc@example.com"
+    assert metadata.to_addr is None
+
+
+def test_decode_mime_words() -> None:
+    """Test decoding of MIME encoded words."""
+    assert decode_mime_words("Plain subject") == "Plain subject"
+    # A character split across two encoded words
+    assert decode_mime_words("=?utf-8?q?Caf=C3?= =?utf-8?q?=A9?=") == "Café"
+    # Unknown charsets and invalid bytes do not raise
+    assert decode_mime_words("=?x-unknown?q?abc?=") == "abc"
+    assert decode_mime_words("=?utf-8?q?=FF?=") == "\ufffd"
+
+
+def test_format_address_list() -> None:
+    """Test formatting addresses given in the supported formats."""
+    addresses = [
+        Address(b"Jane Doe", None, b"jane", b"example.com"),
+        (b"=?utf-8?q?J=C3=B6rg?=", b"", b"jorg", b"example.com"),
+        SimpleNamespace(name=None, mailbox="list", host=None),
+        ("too", "short"),
+        object(),
+    ]
+
+    assert format_address_list(addresses) == (
+        '"Jane Doe" <jane@example.com>, Jörg <jorg@example.com>, <list>'
+    )
+    assert format_address_list(None) is None
+
+
+def test_from_envelope_data() -> None:
+    """Test creating metadata from an envelope and extra header fields."""
+    address = Address(b"Jane Doe", None, b"jane", b"example.com")
+    envelope = Envelope(
+        datetime(2024, 1, 1, 12, 0, 0),
+        b"=?utf-8?q?Caf=C3=A9?=",
+        (address,),
+        (address,),
+        (address,),
+        (address,),
+        None,
+        None,
+        b"<0@example.com>",
+        b"<1@example.com>",
+    )
+
+    metadata = EmailMetadata.from_envelope_data(
+        1,
+        {
+            b"ENVELOPE": envelope,
+            b"RFC822.SIZE": 1024,
+            b"INTERNALDATE": datetime(2024, 1, 1, 12, 0, 1),
+            b"FLAGS": (b"\\Seen",),
+            HEADER_FIELDS_KEY: (
+                b"References: <a@example.com>\r\n <0@example.com>\r\n\r\n"
+            ),
+        },
+    )
+
+    assert metadata.subject == "Café"
+    assert metadata.from_addr == '"Jane Doe" <jane@example.com>'
+    assert metadata.in_reply_to == "<0@example.com>"
+    assert metadata.message_id == "<1@example.com>"
+    assert metadata.references == "<a@example.com> <0@example.com>"
+    assert metadata.flags == ["\\Seen"]
+
+
+def test_fetch_full_email() -> None:
+    """Test that the full message is fetched without marking it as seen."""
+    client = MagicMock()
+    client.fetch.return_value = {
+        1: {FULL_MESSAGE_KEY: b"Subject: Hello\r\n\r\nBody\r\n"}
+    }
+    metadata = EmailMetadata(uid=1, internal_date=datetime(2024, 1, 1, 12, 0, 0))
+
+    message = metadata.fetch_full_email(client, "INBOX")
+
+    client.select_folder.assert_called_once_with("INBOX")
+    client.fetch.assert_called_once_with([1], [FULL_MESSAGE_ITEM])
+    assert message["subject"] == "Hello"
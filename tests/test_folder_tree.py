@@ -0,0 +1,22 @@
+"""Tests for the Gmail TUI folder tree widget.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from unittest.mock import patch
+
+from gmail_tui.widgets.folder_tree import FolderTree
+
+
+def test_configured_bindings(mock_config) -> None:
+    """Test that keys bound in the configuration are registered."""
+    mock_config.bindings = {"x": "refresh_directories", "y": "unknown_action"}
+
+    with patch("gmail_tui.widgets.folder_tree.get_config", return_value=mock_config):
+        folder_tree = FolderTree()
+
+    bindings = folder_tree._bindings.key_to_bindings
+    assert [binding.action for binding in bindings["x"]] == ["refresh_directories"]
+    assert bindings["x"][0].description == "Refresh"
+    assert "y" not in bindings
@@ -0,0 +1,86 @@
+"""Tests for Gmail TUI IMAP utilities.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from imapclient.response_types import Envelope
+
+from gmail_tui.utils.imap import (
+    FETCH_BATCH_SIZE,
+    NOOP_IDLE_SECONDS,
+    close_all_imap_connections,
+    fetch_email_metadata,
+    fetch_in_batches,
+    get_imap_connection,
+)
+
+
+def test_fetch_in_batches(mock_imap_client) -> None:
+    """Test that large fetches are split into several FETCH commands."""
+    messages = list(range(1, 2 * FETCH_BATCH_SIZE + 2))
+    mock_imap_client.fetch.side_effect = lambda uids, _data: {
+        uid: {b"FLAGS": ()} for uid in uids
+    }
+
+    result = fetch_in_batches(mock_imap_client, messages, ["FLAGS"])
+
+    assert list(result) == messages
+    assert [len(call.args[0]) for call in mock_imap_client.fetch.call_args_list] == [
+        FETCH_BATCH_SIZE,
+        FETCH_BATCH_SIZE,
+        1,
+    ]
+
+
+def test_fetch_email_metadata_sorted_by_server(mock_imap_client) -> None:
+    """Test that only the newest messages are fetched when SORT is supported."""
+    mock_imap_client.has_capability.return_value = True
+    mock_imap_client.sort.return_value = [3, 2, 1]
+    envelope = Envelope(
+        None, b"Subject", None, None, None, None, None, None, None, None
+    )
+    mock_imap_client.fetch.side_effect = lambda uids, _data: {
+        uid: {
+            b"ENVELOPE": envelope,
+            b"INTERNALDATE": datetime(2024, 1, uid),
+            b"RFC822.SIZE": 0,
+        }
+        for uid in uids
+    }
+
+    emails = fetch_email_metadata(mock_imap_client, "INBOX", limit=2)
+
+    mock_imap_client.sort.assert_called_once_with(["REVERSE ARRIVAL"], ["ALL"])
+    mock_imap_client.search.assert_not_called()
+    mock_imap_client.fetch.assert_called_once()
+    assert [email.uid for email in emails] == [3, 2]
+
+
+def test_pooled_connection_checked_only_after_idle(mock_imap_client) -> None:
+    """Test that NOOP is only sent to connections idle for a while."""
+    with (
+        patch(
+            "gmail_tui.utils.imap.connect_imap", return_value=mock_imap_client
+        ) as connect,
+        patch("gmail_tui.utils.imap.time.monotonic", return_value=1000.0) as now,
+    ):
+        with get_imap_connection("user", "password") as client:
+            assert client is mock_imap_client
+
+        # Reused right away, without a liveness check
+        with get_imap_connection("user", "password") as client:
+            assert client is mock_imap_client
+        mock_imap_client.noop.assert_not_called()
+
+        # Reused after a long idle time, with a liveness check
+        now.return_value += NOOP_IDLE_SECONDS + 1
+        with get_imap_connection("user", "password") as client:
+            assert client is mock_imap_client
+        mock_imap_client.noop.assert_called_once()
+
+        connect.assert_called_once()
+        close_all_imap_connections()
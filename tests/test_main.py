@@ -0,0 +1,31 @@
+"""Tests for the Gmail TUI command line entry point.
+
+SPDX-FileCopyrightText: 2024 Chen Linxuan <me@black-desk.cn>
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from unittest.mock import patch
+
+import gmail_tui
+
+
+def test_main_loads_only_requested_command() -> None:
+    """Test that only the requested command is imported and run."""
+    with (
+        patch("sys.argv", ["gmail-tui", "ls", "--limit", "5"]),
+        patch("gmail_tui.commands.list.ListCommand.handle") as handle,
+        patch("gmail_tui._load_command", wraps=gmail_tui._load_command) as load,
+    ):
+        gmail_tui.main()
+
+    load.assert_called_once_with("ls")
+    handle.assert_called_once()
+    assert handle.call_args.args[0].limit == 5  # noqa: PLR2004
+
+
+def test_command_table_matches_commands() -> None:
+    """Test that each command in the table has the listed name and help text."""
+    for name, (_, _, help_text) in gmail_tui._COMMANDS.items():
+        command = gmail_tui._load_command(name)
+        assert command.name == name
+        assert command.help == help_text